@@ -6,14 +6,14 @@ A simple tool to generate project plans from documents using AI
 import streamlit as st
 import pandas as pd
 from datetime import datetime, date
-import plotly.express as px
-import plotly.graph_objects as go
-from io import BytesIO
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Import our custom modules
 from utils import extract_document_text, clean_text, validate_project_data
-from document_analyzer import DocumentAnalyzer
-from project_planner import ProjectPlanner
+from project_planner import ProjectPlanner, DATE_FORMAT, with_duration_text
 
 # Page configuration
 st.set_page_config(
@@ -37,10 +37,29 @@ if 'planner' not in st.session_state:
 @st.cache_resource
 def initialize_components():
     """Initialize AI components"""
+    # Imported here so transformers is only loaded once, behind the resource cache
+    from document_analyzer import DocumentAnalyzer
+    
     analyzer = DocumentAnalyzer()
     planner = ProjectPlanner()
     return analyzer, planner
 
+@st.cache_resource
+def _get_executor():
+    """Background workers for model inference, shared by all sessions"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def _submit_in_background(fn, *args):
+    """Run fn on the background executor with this session's script context attached"""
+    ctx = get_script_run_ctx()
+    
+    def run():
+        # Lets st.error and friends inside fn reach this session's page
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+    
+    return _get_executor().submit(run)
+
 def main():
     """Main application function"""
     # Header
@@ -120,7 +139,17 @@ def generate_project_plan(project_name, uploaded_file, start_date):
         
         # Analyze document
         with st.spinner("🧠 Analyzing document with AI..."):
-            project_info = st.session_state.analyzer.extract_project_info(cleaned_text, project_name)
+            future = _submit_in_background(
+                st.session_state.analyzer.extract_project_info, cleaned_text, project_name
+            )
+            progress = st.progress(0)
+            ticks = 0
+            while not future.done():
+                time.sleep(0.1)
+                ticks += 1
+                progress.progress(min(ticks, 95))  # Inference time is unknown, hold just short of done
+            progress.empty()
+            project_info = future.result()
             
         if not project_info:
             st.error("Could not analyze the document. Please try a different file.")
@@ -144,6 +173,28 @@ def generate_project_plan(project_name, uploaded_file, start_date):
     except Exception as e:
         st.error(f"Error generating project plan: {str(e)}")
 
+def _plan_changed():
+    """Apply the rows edited, added or deleted in the data editor to the stored plan"""
+    changes = st.session_state.project_plan_editor
+    df = st.session_state.project_plan.copy()
+    
+    # Cell edits are keyed by row position, then column name; group them so each column is written once
+    column_edits = {}
+    for row, edits in changes.get("edited_rows", {}).items():
+        for column, value in edits.items():
+            column_edits.setdefault(column, {})[int(row)] = value
+    for column, edits in column_edits.items():
+        df.iloc[list(edits), df.columns.get_loc(column)] = list(edits.values())
+    
+    added_rows = changes.get("added_rows", [])
+    deleted_rows = changes.get("deleted_rows", [])
+    if deleted_rows:
+        df = df.drop(df.index[deleted_rows])
+    if added_rows:
+        df = pd.concat([df, pd.DataFrame(added_rows)], ignore_index=True)
+    
+    st.session_state.project_plan = df.reset_index(drop=True)
+
 def display_project_plan():
     """Display the generated project plan"""
     if st.session_state.project_plan is not None:
@@ -159,19 +210,17 @@ def display_project_plan():
                 "Name": st.column_config.TextColumn("Task Name", width="medium"),
                 "Active": st.column_config.SelectboxColumn("Active", options=["Yes", "No"], width="small"),
                 "Task Mode": st.column_config.SelectboxColumn("Mode", options=["Auto Scheduled", "Manually Scheduled"]),
-                "Duration": st.column_config.TextColumn("Duration", width="small"),
+                "Duration_days": st.column_config.NumberColumn("Duration", format="%d days", min_value=0, step=1, width="small"),
                 "Start": st.column_config.TextColumn("Start Date", width="small"),
                 "Finish": st.column_config.TextColumn("Finish Date", width="small"),
                 "Predecessors": st.column_config.TextColumn("Predecessors", width="small"),
                 "Outline Level": st.column_config.NumberColumn("Level", width="small"),
                 "Notes": st.column_config.TextColumn("Notes", width="large")
             },
-            key="project_plan_editor"
+            key="project_plan_editor",
+            on_change=_plan_changed
         )
         
-        # Update session state with edited data
-        st.session_state.project_plan = edited_df
-        
         # Action buttons
         col1, col2, col3, col4 = st.columns(4)
         
@@ -253,17 +302,10 @@ def display_project_stats():
         active_tasks = len(df[df['Active'] == 'Yes']) - 1
         
         # Duration calculation
-        durations = []
-        for duration_str in df['Duration']:
-            if 'days' in str(duration_str):
-                try:
-                    days = int(duration_str.split()[0])
-                    durations.append(days)
-                except:
-                    pass
-        
-        total_duration = sum(durations) if durations else 0
-        avg_duration = round(total_duration / len(durations), 1) if durations else 0
+        durations = pd.to_numeric(df['Duration_days'], errors='coerce').dropna().astype(int)
+        
+        total_duration = int(durations.sum())
+        avg_duration = round(durations.mean(), 1) if len(durations) else 0
         
         # Display metrics
         col1, col2 = st.columns(2)
@@ -289,38 +331,33 @@ def display_project_timeline(df):
     """Display project timeline visualization"""
     st.subheader("📈 Project Timeline")
     
+    # Plotly is only needed once the timeline is requested
+    import plotly.express as px
+    
     try:
-        # Prepare data for timeline
-        timeline_data = []
-        
-        for _, row in df.iterrows():
-            if row['ID'] == 0:  # Skip summary row for timeline
-                continue
-                
-            try:
-                start_date = datetime.strptime(row['Start'], '%a %m/%d/%y')
-                finish_date = datetime.strptime(row['Finish'], '%a %m/%d/%y')
-                
-                timeline_data.append({
-                    'Task': row['Name'],
-                    'Start': start_date,
-                    'Finish': finish_date,
-                    'Duration': (finish_date - start_date).days,
-                    'Level': row.get('Outline Level', 1)
-                })
-            except:
-                continue
-        
-        if timeline_data:
+        # Prepare data for timeline, parsing whole columns at once
+        tasks = df[df['ID'] != 0]  # Skip summary row for timeline
+        starts = pd.to_datetime(tasks['Start'], format=DATE_FORMAT, errors='coerce', cache=True)
+        finishes = pd.to_datetime(tasks['Finish'], format=DATE_FORMAT, errors='coerce', cache=True)
+        
+        timeline_df = pd.DataFrame({
+            'Task': tasks['Name'],
+            'Start': starts,
+            'Finish': finishes,
+            'Duration': (finishes - starts).dt.days,
+            'Level': tasks.get('Outline Level', 1)
+        }).dropna(subset=['Start', 'Finish']).astype({'Duration': int})
+        
+        if not timeline_df.empty:
             # Create Gantt chart
             fig = px.timeline(
-                timeline_data,
+                timeline_df,
                 x_start="Start",
                 x_end="Finish",
                 y="Task",
                 color="Level",
                 title="Project Timeline (Gantt Chart)",
-                height=max(400, len(timeline_data) * 30)
+                height=max(400, len(timeline_df) * 30)
             )
             
             fig.update_yaxes(autorange="reversed")  # Tasks from top to bottom
@@ -329,8 +366,8 @@ def display_project_timeline(df):
             st.plotly_chart(fig, use_container_width=True)
             
             # Duration distribution
-            durations = [item['Duration'] for item in timeline_data]
-            if durations:
+            durations = timeline_df['Duration'].to_numpy()
+            if len(durations):
                 fig2 = px.histogram(
                     x=durations,
                     nbins=10,
@@ -346,9 +383,7 @@ def save_project_plan_csv(df):
     """Save project plan as CSV"""
     try:
         # Convert dataframe to CSV
-        csv_buffer = BytesIO()
-        df.to_csv(csv_buffer, index=False)
-        csv_data = csv_buffer.getvalue()
+        csv_data = with_duration_text(df).to_csv(index=False).encode('utf-8')
         
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -5,38 +5,173 @@ import streamlit as st
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 import re
 import nltk
+from itertools import islice
 from datetime import datetime, timedelta
-import random
+import numpy as np
+import pandas as pd
+import torch
+import queue
+import threading
+import time
+from concurrent.futures import Future
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Precompiled patterns used while scanning document text
+# Special characters (dropped) or whitespace runs (collapsed), matched in one pass
+_CLEAN_RE = re.compile(r'([^\w\s\.,!?;:\-()]+)|\s+')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_DURATION_RE = re.compile(r'(\d+)\s*(day|week|month)s?', re.IGNORECASE)
+# Length of each duration unit in days
+_UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30}
+_HIGH_PRIORITY_RE = re.compile(r'critical|urgent|important|key|essential', re.IGNORECASE)
+_DATE_RES = [
+    re.compile(r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'),
+    re.compile(r'(\d{4}-\d{2}-\d{2})'),
+    re.compile(r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4}', re.IGNORECASE)
+]
+
+def _keyword_pattern(keywords):
+    """Compile a list of keywords into a single case-insensitive alternation"""
+    return re.compile(r'\b(?:' + '|'.join(map(re.escape, keywords)) + ')', re.IGNORECASE)
+
+def _clean_replacement(match):
+    """Replacement for _CLEAN_RE: drop special characters, collapse whitespace"""
+    return '' if match.group(1) else ' '
+
+def _word_index(sentence, pos):
+    """Return the index of the whitespace-separated word containing position pos"""
+    prefix = sentence[:pos]
+    index = len(prefix.split())
+    if prefix and not prefix[-1].isspace():
+        index -= 1  # Match starts inside a word that was already counted
+    return index
+
+@st.cache_resource
+def _get_sent_tokenizer():
+    """Load the pretrained Punkt sentence tokenizer once per process"""
+    # Download required NLTK data
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt', quiet=True)
+    return nltk.data.load('tokenizers/punkt/english.pickle')
+
+# Only a bounded prefix of the document is summarized, and only the first
+# sentences are scanned for tasks and phases
+SUMMARY_INPUT_CHARS = 1000
+MAX_SCAN_SENTENCES = 500
+
+# Seconds to wait for a batched summary before falling back to the opening sentences
+SUMMARY_TIMEOUT = 60
+
+# Documents up to this many words are not worth running the summarizer on
+SHORT_DOCUMENT_WORDS = 150
+
+# Distilled BART: roughly twice as fast as bart-large-cnn with similar summaries
+SUMMARIZATION_MODEL = "sshleifer/distilbart-cnn-12-6"
+
+@st.cache_resource
+def _get_summarizer():
+    """Load the summarization pipeline once per process"""
+    # Use half precision weights when a GPU is available
+    if torch.cuda.is_available():
+        return pipeline("summarization", model=SUMMARIZATION_MODEL, torch_dtype=torch.float16, device=0)
+    return pipeline("summarization", model=SUMMARIZATION_MODEL)
+
+class SummaryBatcher:
+    """Collect summarization requests from concurrent sessions and run them as one batch"""
+    
+    def __init__(self, summarizer, max_batch_size=8, max_wait=0.05):
+        self.summarizer = summarizer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait  # Seconds to wait for more requests after the first
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(self, text):
+        """Queue text for summarization and return a future for the summary"""
+        future = Future()
+        self._queue.put((text, future))
+        return future
+    
+    def _collect_batch(self):
+        """Block for one request, then gather more until the batch is full or the wait expires"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        """Worker loop draining the request queue"""
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _ in batch]
+            futures = [future for _, future in batch]
+            try:
+                summaries = self.summarizer(
+                    texts, max_length=150, min_length=50, do_sample=False, batch_size=len(texts)
+                )
+                for future, summary in zip(futures, summaries):
+                    future.set_result(summary['summary_text'])
+                error = RuntimeError("Summarizer returned fewer summaries than inputs")
+            except Exception as e:
+                error = e
+            
+            # Never leave a caller waiting, and keep the worker alive for the next batch
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+
+@st.cache_resource
+def _get_summary_batcher():
+    """Create the shared summarization batcher once per process"""
+    return SummaryBatcher(_get_summarizer())
+
+class _UncachedAnalysis(Exception):
+    """Carries an analysis whose summary fell back to the opening sentences"""
+    
+    def __init__(self, project_info):
+        super().__init__("Summarization failed")
+        self.project_info = project_info
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_project_info(_analyzer, text, project_name):
+    """Memoize analysis results on the document text and project name"""
+    # Degraded results are raised rather than returned, so the next run retries the summarizer
+    return _analyzer._analyze(text, project_name)
 
 class DocumentAnalyzer:
     def __init__(self):
         self.setup_models()
     
-    @st.cache_resource
-    def setup_models(_self):
+    def setup_models(self):
         """Initialize AI models for text analysis"""
         try:
-            # Use a lightweight model for text summarization
-            _self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+            # Shared across all analyzer instances and reruns
+            self.summary_batcher = _get_summary_batcher()
             
             # For task extraction, we'll use keyword-based approach combined with NLP
-            _self.task_keywords = [
+            self.task_keywords = [
                 'implement', 'develop', 'create', 'build', 'design', 'test', 'deploy', 
                 'configure', 'setup', 'install', 'analyze', 'review', 'prepare',
                 'execute', 'complete', 'finish', 'deliver', 'validate', 'verify'
             ]
             
-            _self.phase_keywords = [
+            self.phase_keywords = [
                 'phase', 'stage', 'milestone', 'iteration', 'sprint', 'release',
                 'planning', 'analysis', 'design', 'development', 'testing', 'deployment'
             ]
             
+            self._task_kw_re = _keyword_pattern(self.task_keywords)
+            self._phase_kw_re = _keyword_pattern(self.phase_keywords)
+            
             return True
         except Exception as e:
             st.error(f"Error loading AI models: {str(e)}")
@@ -45,88 +180,98 @@ class DocumentAnalyzer:
     def extract_project_info(self, text, project_name):
         """Extract project information from document text"""
         try:
-            # Clean the text
-            text = self._clean_text(text)
-            
-            # Extract basic project info
-            project_info = {
-                'name': project_name,
-                'description': self._extract_description(text),
-                'tasks': self._extract_tasks(text),
-                'timeline': self._extract_timeline_info(text),
-                'phases': self._extract_phases(text)
-            }
-            
-            return project_info
+            return _cached_project_info(self, text, project_name)
+        except _UncachedAnalysis as e:
+            return e.project_info
         except Exception as e:
             st.error(f"Error analyzing document: {str(e)}")
             return None
     
+    def _analyze(self, text, project_name):
+        """Run the full analysis; deterministic, so results can be cached"""
+        # Clean the text
+        text = self._clean_text(text)
+        
+        # Split into sentences once and share them between extractors
+        spans = list(islice(_get_sent_tokenizer().span_tokenize(text), MAX_SCAN_SENTENCES))
+        spans = np.array(spans, dtype=np.int64).reshape(-1, 2)
+        sentences = [text[start:end] for start, end in spans.tolist()]
+        sentence_days = self._sentence_durations(text, spans)
+        
+        # Extract basic project info
+        project_info = {
+            'name': project_name,
+            'description': self._extract_description(text, sentences),
+            'tasks': self._extract_tasks(sentences, sentence_days),
+            'timeline': self._extract_timeline_info(text),
+            'phases': self._extract_phases(sentences)
+        }
+        
+        if project_info['description'] is None:
+            # Summarizer failed: fall back to the opening sentences, without caching
+            project_info['description'] = self._first_sentences(sentences)
+            raise _UncachedAnalysis(project_info)
+        
+        return project_info
+    
     def _clean_text(self, text):
         """Clean and preprocess text"""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove special characters but keep punctuation
-        text = re.sub(r'[^\w\s\.,!?;:\-()]', '', text)
-        return text.strip()
+        # Remove extra whitespace and special characters but keep punctuation
+        return _CLEAN_RE.sub(_clean_replacement, text).strip()
     
-    def _extract_description(self, text):
+    def _extract_description(self, text, sentences):
         """Extract project description using summarization"""
+        # Short documents are already their own summary; skip the model
+        if len(text.split(maxsplit=SHORT_DOCUMENT_WORDS)) <= SHORT_DOCUMENT_WORDS:
+            return self._first_sentences(sentences)
+        
         try:
-            # Limit text length for summarization
-            max_length = 1000
-            if len(text) > max_length:
-                text = text[:max_length]
-            
-            # Generate summary
-            summary = self.summarizer(text, max_length=150, min_length=50, do_sample=False)
-            return summary[0]['summary_text']
+            # Generate summary from a bounded prefix, batched with any concurrent requests
+            return self.summary_batcher.submit(text[:SUMMARY_INPUT_CHARS]).result(timeout=SUMMARY_TIMEOUT)
         except Exception as e:
-            # Fallback: return first few sentences
-            sentences = nltk.sent_tokenize(text)
-            return ' '.join(sentences[:3]) if sentences else "Project description not available"
+            # No summary; _analyze falls back to the first few sentences
+            return None
+    
+    def _first_sentences(self, sentences):
+        """Use the opening sentences as the description"""
+        return ' '.join(sentences[:3]) if sentences else "Project description not available"
     
-    def _extract_tasks(self, text):
-        """Extract potential tasks from text"""
+    def _extract_tasks(self, sentences, sentence_days):
+        """Extract potential tasks from tokenized sentences"""
         tasks = []
-        sentences = nltk.sent_tokenize(text)
         
-        for i, sentence in enumerate(sentences):
-            sentence_lower = sentence.lower()
-            
-            # Look for sentences containing task keywords
-            for keyword in self.task_keywords:
-                if keyword in sentence_lower and len(sentence.split()) > 3:
-                    # Extract task name (simplified)
-                    task_name = self._generate_task_name(sentence, keyword)
-                    if task_name and len(task_name) < 100:
-                        tasks.append({
-                            'name': task_name,
-                            'description': sentence[:200],
-                            'priority': self._estimate_priority(sentence),
-                            'estimated_duration': self._estimate_duration(sentence)
-                        })
-                    break
+        # Look for sentences containing task keywords, scanning all of them at once
+        s = pd.Series(sentences, dtype=object)
+        word_counts = s.str.count(r'\S+')
+        mask = (s.str.contains(self._task_kw_re) & (word_counts > 3)).to_numpy(dtype=bool)
+        candidates = s[mask]
+        
+        priorities = self._estimate_priorities(candidates)
+        durations = self._estimate_durations(sentence_days[mask], word_counts[mask].to_numpy(dtype=int))
+        
+        for sentence, priority, duration in zip(candidates, priorities.tolist(), durations.tolist()):
+            # Extract task name (simplified)
+            match = self._task_kw_re.search(sentence)
+            task_name = self._generate_task_name(sentence, match)
+            if task_name and len(task_name) < 100:
+                tasks.append({
+                    'name': task_name,
+                    'description': sentence[:200],
+                    'priority': priority,
+                    'estimated_duration': duration
+                })
         
         # If no tasks found, generate some default ones
         if not tasks:
-            tasks = self._generate_default_tasks(text)
+            tasks = self._generate_default_tasks()
         
         return tasks[:15]  # Limit to 15 tasks
     
-    def _generate_task_name(self, sentence, keyword):
+    def _generate_task_name(self, sentence, match):
         """Generate a clean task name from sentence"""
         # Find the part of sentence around the keyword
         words = sentence.split()
-        keyword_index = -1
-        
-        for i, word in enumerate(words):
-            if keyword.lower() in word.lower():
-                keyword_index = i
-                break
-        
-        if keyword_index == -1:
-            return None
+        keyword_index = _word_index(sentence, match.start())
         
         # Extract task name (keyword + next few words)
         start_idx = max(0, keyword_index - 1)
@@ -135,106 +280,105 @@ class DocumentAnalyzer:
         
         # Clean and format
         task_name = ' '.join(task_words)
-        task_name = re.sub(r'[^\w\s]', ' ', task_name)
+        task_name = _PUNCT_RE.sub(' ', task_name)
         task_name = ' '.join(task_name.split())  # Remove extra spaces
         
         return task_name.title() if task_name else None
     
-    def _estimate_priority(self, sentence):
-        """Estimate task priority based on keywords"""
-        high_priority_words = ['critical', 'urgent', 'important', 'key', 'essential']
-        sentence_lower = sentence.lower()
-        
-        for word in high_priority_words:
-            if word in sentence_lower:
-                return 'High'
-        
-        return random.choice(['Medium', 'Low'])
+    def _estimate_priorities(self, sentences):
+        """Estimate task priorities for a Series of sentences based on keywords"""
+        high = sentences.str.contains(_HIGH_PRIORITY_RE).to_numpy(dtype=bool)
+        # Longer sentences tend to describe more substantial work
+        longer = (sentences.str.len() > 80).to_numpy(dtype=bool)
+        return np.where(high, 'High', np.where(longer, 'Medium', 'Low'))
     
-    def _estimate_duration(self, sentence):
-        """Estimate task duration"""
-        # Look for duration patterns in text
-        duration_patterns = [
-            r'(\d+)\s*(day|days)',
-            r'(\d+)\s*(week|weeks)',
-            r'(\d+)\s*(month|months)'
+    def _sentence_durations(self, text, spans):
+        """Find the first stated duration (in days) of each sentence, -1 where there is none"""
+        days = np.full(len(spans), -1, dtype=np.int64)
+        if not len(spans):
+            return days
+        
+        # One regex sweep over the scanned part of the document, capped at 30 days
+        # before the int64 cast so arbitrarily long digit runs cannot overflow
+        matches = [
+            (m.start(), m.end(), min(int(m.group(1)) * _UNIT_DAYS[m.group(2).lower()], 30))
+            for m in _DURATION_RE.finditer(text, 0, int(spans[-1, 1]))
         ]
+        if not matches:
+            return days
         
-        for pattern in duration_patterns:
-            matches = re.findall(pattern, sentence.lower())
-            if matches:
-                num, unit = matches[0]
-                days = int(num)
-                if 'week' in unit:
-                    days *= 7
-                elif 'month' in unit:
-                    days *= 30
-                return min(days, 30)  # Cap at 30 days
+        # Map each match to the sentence it falls in
+        matches = np.array(matches, dtype=np.int64)
+        starts, ends = spans[:, 0], spans[:, 1]
+        idx = np.searchsorted(starts, matches[:, 0], side='right') - 1
+        inside = (idx >= 0) & (matches[:, 1] <= ends[idx])
+        idx, found = idx[inside], matches[inside, 2]
         
-        # Default duration based on task complexity
-        return random.randint(1, 10)
+        # Keep the first mention per sentence
+        sentence_idx, first = np.unique(idx, return_index=True)
+        days[sentence_idx] = found[first]
+        return days
+    
+    def _estimate_durations(self, stated_days, word_counts):
+        """Estimate task durations in days from stated durations and sentence lengths"""
+        # Default duration based on task complexity (one day per five words, 1-10 days)
+        fallback = np.clip(word_counts // 5, 1, 10)
+        return np.where(stated_days >= 0, stated_days, fallback)
     
     def _extract_timeline_info(self, text):
         """Extract timeline information"""
         timeline = {}
         
-        # Look for date patterns
-        date_patterns = [
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            r'(\d{4}-\d{2}-\d{2})',
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2},?\s+\d{4}'
-        ]
-        
+        # Look for date patterns; only the matches are lowercased, not the whole text
         dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text.lower())
-            dates.extend(matches)
+        for pattern in _DATE_RES:
+            matches = pattern.findall(text)
+            dates.extend(match.lower() for match in matches)
         
         if dates:
             timeline['mentioned_dates'] = dates[:5]  # Keep first 5 dates
         
         # Look for duration mentions
-        duration_matches = re.findall(r'(\d+)\s*(day|week|month)s?', text.lower())
+        duration_matches = [(num, unit.lower()) for num, unit in _DURATION_RE.findall(text)]
         if duration_matches:
             timeline['durations'] = duration_matches[:3]
         
         return timeline
     
-    def _extract_phases(self, text):
-        """Extract project phases"""
+    def _extract_phases(self, sentences):
+        """Extract project phases from tokenized sentences"""
         phases = []
-        sentences = nltk.sent_tokenize(text)
+        seen = set()
         
         for sentence in sentences:
-            sentence_lower = sentence.lower()
-            for keyword in self.phase_keywords:
-                if keyword in sentence_lower:
-                    phase_name = self._extract_phase_name(sentence, keyword)
-                    if phase_name:
-                        phases.append(phase_name)
-                    break
-        
-        # Remove duplicates and limit
-        phases = list(dict.fromkeys(phases))[:5]
+            # Stop once enough unique phases are found
+            if len(phases) >= 5:
+                break
+            match = self._phase_kw_re.search(sentence)
+            if not match:
+                continue
+            phase_name = self._extract_phase_name(sentence, match)
+            if phase_name and phase_name not in seen:
+                seen.add(phase_name)
+                phases.append(phase_name)
+        
         return phases
     
-    def _extract_phase_name(self, sentence, keyword):
+    def _extract_phase_name(self, sentence, match):
         """Extract phase name from sentence"""
         # Simple extraction around the keyword
         words = sentence.split()
-        for i, word in enumerate(words):
-            if keyword.lower() in word.lower():
-                # Get surrounding words
-                start = max(0, i-2)
-                end = min(len(words), i+3)
-                phase_words = words[start:end]
-                phase_name = ' '.join(phase_words)
-                # Clean
-                phase_name = re.sub(r'[^\w\s]', ' ', phase_name)
-                return ' '.join(phase_name.split()).title()
-        return None
-    
-    def _generate_default_tasks(self, text):
+        i = _word_index(sentence, match.start())
+        # Get surrounding words
+        start = max(0, i-2)
+        end = min(len(words), i+3)
+        phase_words = words[start:end]
+        phase_name = ' '.join(phase_words)
+        # Clean
+        phase_name = _PUNCT_RE.sub(' ', phase_name)
+        return ' '.join(phase_name.split()).title()
+    
+    def _generate_default_tasks(self):
         """Generate default tasks if none found"""
         default_tasks = [
             {'name': 'Project Planning', 'description': 'Plan project scope and timeline', 'priority': 'High', 'estimated_duration': 3},
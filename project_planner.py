@@ -1,11 +1,51 @@
 """
 Project planner that generates structured project plans from analyzed document data
 """
+import numpy as np
 import pandas as pd
+import re
 from datetime import datetime, timedelta
 import streamlit as st
 
+# Arrow-backed strings when pyarrow is installed, plain object columns otherwise
+try:
+    import pyarrow  # noqa: F401
+    _STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    _STRING_DTYPE = object
+
+# Display format of the Start and Finish columns
+DATE_FORMAT = '%a %m/%d/%y'
+
+# Outline level keywords, matched anywhere in the task name
+_LEVEL1_RE = re.compile(r'phase|stage|planning|design|development|testing|deployment', re.IGNORECASE)  # Main phases
+_LEVEL2_RE = re.compile(r'setup|configure|create|implement', re.IGNORECASE)  # Sub-tasks
+_LEVEL3_RE = re.compile(r'review|validate|test|document', re.IGNORECASE)  # Detailed tasks
+
+class Task:
+    """A single task to schedule; slotted to keep large plans compact"""
+    __slots__ = ('name', 'estimated_duration', 'priority', 'description')
+    
+    def __init__(self, name, estimated_duration=5, priority='Medium', description=''):
+        self.name = name
+        self.estimated_duration = estimated_duration
+        self.priority = priority
+        self.description = description
+
+def with_duration_text(df):
+    """Return a copy of the plan with Duration_days rendered as the "N days" Duration column"""
+    df = df.copy()
+    days = pd.to_numeric(df['Duration_days'], errors='coerce').round().astype('Int64')
+    df['Duration_days'] = days.astype('string') + ' days'  # Missing durations stay missing
+    return df.rename(columns={'Duration_days': 'Duration'})
+
 class ProjectPlanner:
+    # Plan columns in display order, and the dtypes of the numeric (nullable, so cleared
+    # editor cells can hold NA) and Arrow string ones
+    _COLS = ('ID', 'Name', 'Active', 'Task Mode', 'Duration_days', 'Start', 'Finish', 'Predecessors', 'Outline Level', 'Notes')
+    _DTYPES = {'ID': 'Int64', 'Duration_days': 'Int64', 'Outline Level': 'Int8',
+               'Start': _STRING_DTYPE, 'Finish': _STRING_DTYPE, 'Predecessors': _STRING_DTYPE}
+    
     def __init__(self):
         self.task_modes = ['Auto Scheduled', 'Manually Scheduled']
         self.default_start_date = datetime.now().date()
@@ -13,52 +53,50 @@ class ProjectPlanner:
     def generate_project_plan(self, project_info):
         """Generate a structured project plan from analyzed project information"""
         try:
-            tasks = project_info.get('tasks', [])
+            # Accept analyzer task dicts as well as Task instances
+            tasks = [t if isinstance(t, Task) else Task(**t) for t in project_info.get('tasks', [])]
             project_name = project_info.get('name', 'Untitled Project')
             
-            # Create project plan data
-            plan_data = []
-            current_date = self.default_start_date
+            # Build the plan column by column
+            n = len(tasks)
             
-            for i, task in enumerate(tasks):
-                # Calculate task details
-                task_id = i + 1
-                duration = task.get('estimated_duration', 5)
-                start_date = current_date
-                finish_date = start_date + timedelta(days=duration)
-                
+            # Gather the per-task fields in one pass, with the hot lookups bound to locals
+            names, durations, notes = [], [], []
+            add_name, add_duration, add_note = names.append, durations.append, notes.append
+            task_notes = self._generate_task_notes
+            for task in tasks:
+                add_name(task.name)
+                add_duration(task.estimated_duration)
+                add_note(task_notes(task))
+            durations = np.array(durations, dtype='int64')
+            
+            # Each task starts max(1, duration // 2) days after the previous one (some overlap)
+            offsets = np.concatenate([[0], np.maximum(1, durations[:-1] // 2).cumsum()])[:n]
+            start_dates = np.datetime64(self.default_start_date, 'D') + offsets.astype('timedelta64[D]')
+            finish_dates = start_dates + durations.astype('timedelta64[D]')
+            
+            plan_data = {
+                'Name': names,
+                'Active': ['Yes'] * n,
+                'Task Mode': ['Auto Scheduled'] * n,
+                'Duration_days': durations.tolist(),
+                'Start': pd.DatetimeIndex(start_dates).strftime(DATE_FORMAT).tolist(),
+                'Finish': pd.DatetimeIndex(finish_dates).strftime(DATE_FORMAT).tolist(),
                 # Determine predecessors (simple dependency logic)
-                predecessors = self._calculate_predecessors(task_id, i, tasks)
-                
+                'Predecessors': self._calculate_predecessors(names).tolist(),
                 # Determine outline level
-                outline_level = self._determine_outline_level(task['name'])
-                
-                # Create task row
-                task_row = {
-                    'ID': task_id,
-                    'Name': task['name'],
-                    'Active': 'Yes',
-                    'Task Mode': 'Auto Scheduled',
-                    'Duration': f"{duration} days",
-                    'Start': start_date.strftime('%a %m/%d/%y'),
-                    'Finish': finish_date.strftime('%a %m/%d/%y'),
-                    'Predecessors': predecessors,
-                    'Outline Level': outline_level,
-                    'Notes': self._generate_task_notes(task)
-                }
-                
-                plan_data.append(task_row)
-                
-                # Update current date for next task (with some overlap)
-                current_date = start_date + timedelta(days=max(1, duration // 2))
+                'Outline Level': self._determine_outline_levels(names).tolist(),
+                'Notes': notes
+            }
             
-            # Convert to DataFrame
-            df = pd.DataFrame(plan_data)
+            # Add summary row at the beginning of every column
+            if n:
+                summary_row = self._create_summary_row(project_name, start_dates, finish_dates, durations)
+                plan_data = {col: [summary_row[col]] + values for col, values in plan_data.items()}
             
-            # Add summary row at the beginning
-            summary_row = self._create_summary_row(project_name, df)
-            df = pd.concat([summary_row, df], ignore_index=True)
-            df['ID'] = range(1, len(df) + 1)
+            # Convert to DataFrame in one go, IDs included
+            df = pd.DataFrame({'ID': np.arange(1, len(plan_data['Name']) + 1), **plan_data}, columns=self._COLS)
+            df = df.astype(self._DTYPES)
             
             return df
             
@@ -66,41 +104,30 @@ class ProjectPlanner:
             st.error(f"Error generating project plan: {str(e)}")
             return self._create_default_plan()
     
-    def _calculate_predecessors(self, task_id, task_index, tasks):
+    def _calculate_predecessors(self, names):
         """Calculate task predecessors based on simple dependency logic"""
-        if task_index == 0:
-            return ""  # First task has no predecessors
+        # Simple logic: some tasks depend on previous task (60% chance of dependency)
+        hashes = pd.util.hash_array(np.asarray(names, dtype=object))
+        positions = np.arange(len(names))
+        depends = (hashes % 10 < 6) & (positions > 0)  # First task has no predecessors
         
-        # Simple logic: some tasks depend on previous task
-        dependency_chance = 0.6  # 60% chance of dependency
-        
-        if task_index > 0 and hash(tasks[task_index]['name']) % 10 < 6:
-            return str(task_id - 1)
-        
-        return ""
+        # Task i (0-based) has ID i + 1, so its predecessor's ID is i
+        return np.where(depends, positions.astype('U16'), '')
     
-    def _determine_outline_level(self, task_name):
-        """Determine outline level based on task name"""
-        task_lower = task_name.lower()
-        
-        # Level 1: Main phases
-        if any(word in task_lower for word in ['phase', 'stage', 'planning', 'design', 'development', 'testing', 'deployment']):
-            return 1
-        
-        # Level 2: Sub-tasks
-        if any(word in task_lower for word in ['setup', 'configure', 'create', 'implement']):
-            return 2
-        
-        # Level 3: Detailed tasks
-        if any(word in task_lower for word in ['review', 'validate', 'test', 'document']):
-            return 3
-        
-        return 2  # Default level
+    def _determine_outline_levels(self, names):
+        """Determine outline levels for a list of task names at once"""
+        s = pd.Series(names, dtype=object)
+        conditions = [
+            s.str.contains(_LEVEL1_RE, na=False).to_numpy(dtype=bool),
+            s.str.contains(_LEVEL2_RE, na=False).to_numpy(dtype=bool),
+            s.str.contains(_LEVEL3_RE, na=False).to_numpy(dtype=bool)
+        ]
+        return np.select(conditions, [1, 2, 3], default=2)
     
     def _generate_task_notes(self, task):
         """Generate notes for a task"""
-        priority = task.get('priority', 'Medium')
-        description = task.get('description', '')
+        priority = task.priority
+        description = task.description
         
         # Truncate description if too long
         if len(description) > 100:
@@ -109,64 +136,38 @@ class ProjectPlanner:
         notes = f"Priority: {priority}. {description}"
         return notes
     
-    def _create_summary_row(self, project_name, df):
-        """Create a summary row for the entire project"""
-        if df.empty:
-            return pd.DataFrame()
-        
+    def _create_summary_row(self, project_name, start_dates, finish_dates, durations):
+        """Create the summary row values for the entire project from the task date and duration arrays"""
         # Calculate project totals
-        total_duration = sum([int(d.split()[0]) for d in df['Duration'] if 'days' in d])
-        start_dates = [datetime.strptime(d, '%a %m/%d/%y') for d in df['Start']]
-        finish_dates = [datetime.strptime(d, '%a %m/%d/%y') for d in df['Finish']]
-        
-        project_start = min(start_dates).strftime('%a %m/%d/%y')
-        project_finish = max(finish_dates).strftime('%a %m/%d/%y')
-        
-        summary_data = {
-            'ID': [0],
-            'Name': [project_name],
-            'Active': ['Yes'],
-            'Task Mode': ['Auto Scheduled'],
-            'Duration': [f"{total_duration} days"],
-            'Start': [project_start],
-            'Finish': [project_finish],
-            'Predecessors': [''],
-            'Outline Level': [0],
-            'Notes': ['This roadmap is intended to guide the project execution.']
+        total_duration = int(durations.sum())
+        project_start = pd.Timestamp(start_dates.min()).strftime(DATE_FORMAT)
+        project_finish = pd.Timestamp(finish_dates.max()).strftime(DATE_FORMAT)
+        
+        return {
+            'Name': project_name,
+            'Active': 'Yes',
+            'Task Mode': 'Auto Scheduled',
+            'Duration_days': total_duration,
+            'Start': project_start,
+            'Finish': project_finish,
+            'Predecessors': '',
+            'Outline Level': 0,
+            'Notes': 'This roadmap is intended to guide the project execution.'
         }
-        
-        return pd.DataFrame(summary_data)
     
     def _create_default_plan(self):
         """Create a default project plan if generation fails"""
+        start = self.default_start_date
         default_data = [
-            {
-                'ID': 1,
-                'Name': 'Sample Project',
-                'Active': 'Yes',
-                'Task Mode': 'Auto Scheduled',
-                'Duration': '30 days',
-                'Start': self.default_start_date.strftime('%a %m/%d/%y'),
-                'Finish': (self.default_start_date + timedelta(days=30)).strftime('%a %m/%d/%y'),
-                'Predecessors': '',
-                'Outline Level': 1,
-                'Notes': 'Default project plan generated'
-            },
-            {
-                'ID': 2,
-                'Name': 'Planning Phase',
-                'Active': 'Yes',
-                'Task Mode': 'Auto Scheduled',
-                'Duration': '5 days',
-                'Start': self.default_start_date.strftime('%a %m/%d/%y'),
-                'Finish': (self.default_start_date + timedelta(days=5)).strftime('%a %m/%d/%y'),
-                'Predecessors': '',
-                'Outline Level': 2,
-                'Notes': 'Project planning and requirements gathering'
-            }
+            (1, 'Sample Project', 'Yes', 'Auto Scheduled', 30,
+             start.strftime(DATE_FORMAT), (start + timedelta(days=30)).strftime(DATE_FORMAT),
+             '', 1, 'Default project plan generated'),
+            (2, 'Planning Phase', 'Yes', 'Auto Scheduled', 5,
+             start.strftime(DATE_FORMAT), (start + timedelta(days=5)).strftime(DATE_FORMAT),
+             '', 2, 'Project planning and requirements gathering')
         ]
         
-        return pd.DataFrame(default_data)
+        return pd.DataFrame.from_records(default_data, columns=self._COLS).astype(self._DTYPES)
     
     def update_plan_dates(self, df, new_start_date):
         """Update all dates in the plan based on a new start date"""
@@ -174,20 +175,16 @@ class ProjectPlanner:
             if df.empty:
                 return df
             
+            # Parse both date columns once
+            starts = pd.to_datetime(df['Start'], format=DATE_FORMAT, cache=True)
+            finishes = pd.to_datetime(df['Finish'], format=DATE_FORMAT, cache=True)
+            
             # Calculate the difference from current start
-            current_start = datetime.strptime(df.iloc[0]['Start'], '%a %m/%d/%y').date()
-            date_diff = new_start_date - current_start
+            delta = pd.Timedelta(days=(new_start_date - starts.iloc[0].date()).days)
             
-            # Update all dates
-            for index, row in df.iterrows():
-                old_start = datetime.strptime(row['Start'], '%a %m/%d/%y').date()
-                old_finish = datetime.strptime(row['Finish'], '%a %m/%d/%y').date()
-                
-                new_start = old_start + date_diff
-                new_finish = old_finish + date_diff
-                
-                df.at[index, 'Start'] = new_start.strftime('%a %m/%d/%y')
-                df.at[index, 'Finish'] = new_finish.strftime('%a %m/%d/%y')
+            # Shift all dates by the same offset
+            df['Start'] = (starts + delta).dt.strftime(DATE_FORMAT).astype(_STRING_DTYPE)
+            df['Finish'] = (finishes + delta).dt.strftime(DATE_FORMAT).astype(_STRING_DTYPE)
             
             return df
         except Exception as e:
@@ -203,7 +200,7 @@ class ProjectPlanner:
             return issues
         
         # Check required columns
-        required_cols = ['ID', 'Name', 'Duration', 'Start', 'Finish']
+        required_cols = ['ID', 'Name', 'Duration_days', 'Start', 'Finish']
         missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
             issues.append(f"Missing columns: {missing_cols}")
@@ -213,11 +210,11 @@ class ProjectPlanner:
             issues.append("Some tasks have empty names")
         
         # Check date formats
-        try:
-            for date_col in ['Start', 'Finish']:
-                if date_col in df.columns:
-                    df[date_col].apply(lambda x: datetime.strptime(x, '%a %m/%d/%y'))
-        except ValueError:
-            issues.append("Invalid date format detected")
+        for date_col in ['Start', 'Finish']:
+            if date_col in df.columns:
+                parsed = pd.to_datetime(df[date_col], format=DATE_FORMAT, errors='coerce', cache=True)
+                if parsed.isna().any():
+                    issues.append("Invalid date format detected")
+                    break
         
         return issues
\ No newline at end of file
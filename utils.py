@@ -6,15 +6,23 @@ from docx import Document
 import streamlit as st
 import re
 from datetime import datetime, timedelta
+from io import BytesIO
+
+_WS_RE = re.compile(r'\s+')
+
+def _read_bytes(file):
+    """Return the full contents of an uploaded or in-memory file"""
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
 
 def extract_text_from_pdf(pdf_file):
     """Extract text from uploaded PDF file"""
     try:
         pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        parts = [page.extract_text() or "" for page in pdf_reader.pages]
+        return "\n".join(parts) + "\n"
     except Exception as e:
         st.error(f"Error reading PDF: {str(e)}")
         return ""
@@ -23,10 +31,7 @@ def extract_text_from_docx(docx_file):
     """Extract text from uploaded DOCX file"""
     try:
         doc = Document(docx_file)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs) + "\n"
     except Exception as e:
         st.error(f"Error reading DOCX: {str(e)}")
         return ""
@@ -34,35 +39,40 @@ def extract_text_from_docx(docx_file):
 def extract_text_from_txt(txt_file):
     """Extract text from uploaded TXT file"""
     try:
-        text = str(txt_file.read(), "utf-8")
-        return text
+        # A stray invalid byte should not make the whole document unreadable
+        return _read_bytes(txt_file).decode("utf-8", errors="replace")
     except Exception as e:
         st.error(f"Error reading TXT: {str(e)}")
         return ""
 
+# Text extractor for each supported MIME type
+_HANDLERS = {
+    "application/pdf": extract_text_from_pdf,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": extract_text_from_docx,
+    "text/plain": extract_text_from_txt,
+}
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_extract(file_bytes, file_type):
+    """Extract text from raw file contents, memoized on the bytes and MIME type"""
+    return _HANDLERS[file_type](BytesIO(file_bytes))
+
 def extract_document_text(uploaded_file):
     """Main function to extract text from any supported document type"""
     if uploaded_file is None:
         return ""
     
-    file_type = uploaded_file.type
-    
-    if file_type == "application/pdf":
-        return extract_text_from_pdf(uploaded_file)
-    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_text_from_docx(uploaded_file)
-    elif file_type == "text/plain":
-        return extract_text_from_txt(uploaded_file)
-    else:
+    if uploaded_file.type not in _HANDLERS:
         st.error("Unsupported file type!")
         return ""
+    
+    # Reruns with the same upload reuse the extracted text
+    return _cached_extract(_read_bytes(uploaded_file), uploaded_file.type)
 
 def clean_text(text):
     """Clean and preprocess extracted text"""
-    # Remove extra whitespace and newlines
-    text = re.sub(r'\n+', '\n', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # Remove extra whitespace and newlines (any whitespace run, newlines included, becomes one space)
+    return _WS_RE.sub(' ', text).strip()
 
 def calculate_finish_date(start_date, duration_days):
     """Calculate finish date based on start date and duration"""
@@ -76,7 +86,7 @@ def calculate_finish_date(start_date, duration_days):
 
 def validate_project_data(df):
     """Validate project plan data"""
-    required_columns = ['ID', 'Name', 'Active', 'Task Mode', 'Duration', 'Start', 'Finish']
+    required_columns = ['ID', 'Name', 'Active', 'Task Mode', 'Duration_days', 'Start', 'Finish']
     missing_columns = [col for col in required_columns if col not in df.columns]
     
     if missing_columns: